@@ -28,6 +28,27 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Identity columns shared by every weekly stat pull
+ID_COLUMNS = ['player_id', 'player_name', 'position', 'team', 'week', 'season']
+
+# Stat columns fetched for each stat_type
+STAT_COLUMNS = {
+    'passing': ['completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions',
+                'passing_epa', 'passing_first_downs'],
+    'rushing': ['carries', 'rushing_yards', 'rushing_tds', 'rushing_epa', 'rushing_first_downs'],
+    'receiving': ['targets', 'receptions', 'receiving_yards', 'receiving_tds', 'receiving_epa',
+                  'receiving_first_downs'],
+}
+
+# Key (and sort order) of the unified player-week fact table
+PLAYER_WEEK_KEY = ['player_id', 'season', 'week']
+
+# Injury report columns carried into the player-week table
+INJURY_COLUMNS = ['report_status', 'report_primary_injury', 'practice_status']
+
+# Injury report statuses mapped to our injury_status values (anything else is HEALTHY)
+INJURY_STATUS_MAPPING = {'Out': 'OUT', 'Doubtful': 'DOUBTFUL', 'Questionable': 'QUESTIONABLE'}
+
 class NFLDataPipeline:
     def __init__(self, output_dir: str = "data/nfl"):
         self.output_dir = output_dir
@@ -76,20 +97,8 @@ class NFLDataPipeline:
         print(f"📊 Fetching {stat_type} stats for {years}...")
         
         try:
-            if stat_type == 'passing':
-                stats = nfl.import_weekly_data(years, columns=['player_id', 'player_name', 'position', 'team', 
-                                                             'week', 'season', 'completions', 'attempts', 
-                                                             'passing_yards', 'passing_tds', 'interceptions',
-                                                             'passing_epa', 'passing_first_downs'])
-            elif stat_type == 'rushing':
-                stats = nfl.import_weekly_data(years, columns=['player_id', 'player_name', 'position', 'team',
-                                                             'week', 'season', 'carries', 'rushing_yards', 
-                                                             'rushing_tds', 'rushing_epa', 'rushing_first_downs'])
-            elif stat_type == 'receiving':
-                stats = nfl.import_weekly_data(years, columns=['player_id', 'player_name', 'position', 'team',
-                                                             'week', 'season', 'targets', 'receptions', 
-                                                             'receiving_yards', 'receiving_tds', 'receiving_epa',
-                                                             'receiving_first_downs'])
+            if stat_type in STAT_COLUMNS:
+                stats = nfl.import_weekly_data(years, columns=ID_COLUMNS + STAT_COLUMNS[stat_type])
             else:
                 # General stats
                 stats = nfl.import_weekly_data(years)
@@ -167,6 +176,124 @@ class NFLDataPipeline:
             print(f"❌ Error fetching team data: {e}")
             return pd.DataFrame()
 
+    def build_player_week_table(self, years: List[int] = None, weekly: pd.DataFrame = None,
+                                rosters: pd.DataFrame = None, injuries: pd.DataFrame = None,
+                                schedule: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Build one wide player x season x week fact table
+        Passing, rushing and receiving stats come from a single weekly pull and are
+        joined to roster, injury and opponent/game context with vectorized merges.
+        The result is deduplicated, sorted and indexed on (player_id, season, week).
+        Frames that were already fetched can be passed in to avoid refetching.
+        """
+        if years is None:
+            years = [self.current_season]
+        
+        print(f"🧩 Building player-week table for {years}...")
+        
+        try:
+            if weekly is None:
+                stat_columns = [column for columns in STAT_COLUMNS.values() for column in columns]
+                weekly = nfl.import_weekly_data(years, columns=ID_COLUMNS + stat_columns)
+            if rosters is None:
+                rosters = nfl.import_rosters(years)
+            if injuries is None:
+                injuries = nfl.import_injuries(years)
+            if schedule is None:
+                schedule = nfl.import_schedules(years)
+            
+            if weekly.empty:
+                print("❌ No weekly stats, not writing a player-week table")
+                return pd.DataFrame()
+            
+            player_weeks = weekly.drop_duplicates(subset=PLAYER_WEEK_KEY, keep='last')
+            
+            # Roster attributes (identity columns already come from the weekly stats)
+            roster_key = ['player_id', 'season']
+            if rosters.empty:
+                print("⚠️ No roster data, skipping roster join")
+            elif not set(roster_key).issubset(rosters.columns):
+                print(f"⚠️ Roster data is missing {roster_key} key columns, skipping roster join")
+            else:
+                roster_columns = [column for column in ['jersey_number', 'height', 'weight', 'years_exp',
+                                                        'college', 'status'] if column in rosters.columns]
+                rosters = (rosters[roster_key + roster_columns]
+                           .drop_duplicates(subset=roster_key, keep='last')
+                           .rename(columns={'status': 'roster_status'}))
+                player_weeks = player_weeks.merge(rosters, on=roster_key, how='left', validate='many_to_one')
+            
+            # Injury report for the week, keeping the latest revision of each report.
+            # Without injury data the status is unknown (null), not HEALTHY
+            injuries = injuries.rename(columns={'gsis_id': 'player_id'})
+            if injuries.empty:
+                print("⚠️ No injury data, leaving injury status unknown")
+            elif not set(PLAYER_WEEK_KEY).issubset(injuries.columns):
+                print(f"⚠️ Injury data is missing {PLAYER_WEEK_KEY} key columns, skipping injury join")
+            else:
+                injury_columns = [column for column in INJURY_COLUMNS if column in injuries.columns]
+                if 'date_modified' in injuries.columns:
+                    injuries = injuries.sort_values('date_modified', kind='stable')
+                injuries = (injuries[PLAYER_WEEK_KEY + injury_columns]
+                            .drop_duplicates(subset=PLAYER_WEEK_KEY, keep='last'))
+                player_weeks = player_weeks.merge(injuries, on=PLAYER_WEEK_KEY, how='left', validate='many_to_one')
+                if 'report_status' in injury_columns:
+                    player_weeks['injury_status'] = (player_weeks['report_status'].map(INJURY_STATUS_MAPPING)
+                                                     .fillna('HEALTHY'))
+                else:
+                    print("⚠️ Injury data has no report_status column, leaving injury status unknown")
+            for column in INJURY_COLUMNS + ['injury_status']:
+                if column not in player_weeks.columns:
+                    player_weeks[column] = None
+            
+            # Opponent and game context from the team's side of the schedule
+            schedule_key = ['season', 'week', 'home_team', 'away_team']
+            if schedule.empty:
+                print("⚠️ No schedule data, skipping game context join")
+            elif not set(schedule_key).issubset(schedule.columns):
+                print(f"⚠️ Schedule data is missing {schedule_key} columns, skipping game context join")
+            else:
+                player_weeks = player_weeks.merge(self._team_game_context(schedule), on=['season', 'week', 'team'],
+                                                  how='left', validate='many_to_one')
+                if {'team_score', 'opponent_score'}.issubset(player_weeks.columns):
+                    player_weeks['game_total_points'] = player_weeks['team_score'] + player_weeks['opponent_score']
+            
+            player_weeks = player_weeks.sort_values(PLAYER_WEEK_KEY, ignore_index=True)
+            print(f"✅ Built {len(player_weeks)} player-week rows with {len(player_weeks.columns)} columns")
+            
+            # Save to JSON, already in (player_id, season, week) order
+            output_path = f"{self.output_dir}/player_weeks_{'-'.join(map(str, years))}.json"
+            player_weeks.to_json(output_path, orient='records', indent=2)
+            print(f"💾 Saved player-week table to {output_path}")
+            
+            return player_weeks.set_index(PLAYER_WEEK_KEY)
+            
+        except Exception as e:
+            print(f"❌ Error building player-week table: {e}")
+            return pd.DataFrame()
+
+    def _team_game_context(self, schedule: pd.DataFrame) -> pd.DataFrame:
+        """Reshape the one-row-per-game schedule into one row per team per game"""
+        game_columns = [column for column in ['game_id', 'season', 'week', 'gameday', 'total_line', 'roof']
+                        if column in schedule.columns]
+        sides = []
+        
+        for team_side, opponent_side in [('home', 'away'), ('away', 'home')]:
+            side = schedule[game_columns].copy()
+            side['team'] = schedule[f'{team_side}_team']
+            side['opponent'] = schedule[f'{opponent_side}_team']
+            side['is_home_game'] = team_side == 'home'
+            if {'home_score', 'away_score'}.issubset(schedule.columns):
+                side['team_score'] = schedule[f'{team_side}_score']
+                side['opponent_score'] = schedule[f'{opponent_side}_score']
+            if 'spread_line' in schedule.columns:
+                # spread_line is the home team's projected margin (positive = home favored),
+                # so flip it for the away side; this is not a betting-line quote
+                side['team_projected_margin'] = (schedule['spread_line'] if team_side == 'home'
+                                                 else -schedule['spread_line'])
+            sides.append(side)
+        
+        return pd.concat(sides, ignore_index=True)
+
     def create_player_projections_dataset(self, historical_years: List[int] = None) -> Dict:
         """
         Create comprehensive dataset for building projection models
@@ -278,14 +405,17 @@ class NFLDataPipeline:
         
         # Fetch all data types
         self.fetch_team_data()
-        self.fetch_roster_data([self.current_season])
-        self.fetch_schedule_data([self.current_season])
-        self.fetch_injury_reports()
+        rosters = self.fetch_roster_data([self.current_season])
+        schedule = self.fetch_schedule_data([self.current_season])
+        injuries = self.fetch_injury_reports()
         
-        # Fetch stats for different positions
-        self.fetch_player_stats([self.current_season], 'passing')
-        self.fetch_player_stats([self.current_season], 'rushing')
-        self.fetch_player_stats([self.current_season], 'receiving')
+        # Join weekly stats with rosters, injuries and schedule into one table
+        player_weeks = self.build_player_week_table([self.current_season], rosters=rosters,
+                                                    injuries=injuries, schedule=schedule)
+        if player_weeks.empty:
+            # Stop here so nfl-data:full does not go on to transform stale or missing stats
+            print("\n❌ NFL data pipeline stopped: no player-week stats were built")
+            sys.exit(1)
         
         # Create projection dataset
         self.create_player_projections_dataset()
@@ -317,10 +447,12 @@ def main():
         pipeline.fetch_schedule_data()
     elif command == 'injuries':
         pipeline.fetch_injury_reports()
+    elif command == 'player-weeks':
+        pipeline.build_player_week_table()
     elif command == 'projections':
         pipeline.create_player_projections_dataset()
     else:
-        print("Usage: python nfl-data-pipeline.py [full|rosters|stats|schedule|injuries|projections]")
+        print("Usage: python nfl-data-pipeline.py [full|rosters|stats|schedule|injuries|player-weeks|projections]")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test script for the unified player-week fact table
+Runs NFLDataPipeline.build_player_week_table on small in-memory frames and checks
+deduplication, the roster/injury/schedule joins and reads on the sorted index.
+
+Requires the pipeline dependencies (npm run nfl-data:setup); no data is downloaded.
+"""
+
+import importlib.util
+import os
+import tempfile
+
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# nfl-data-pipeline.py is not importable by name, so load it from its path
+spec = importlib.util.spec_from_file_location('nfl_data_pipeline', os.path.join(SCRIPTS_DIR, 'nfl-data-pipeline.py'))
+nfl_data_pipeline = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nfl_data_pipeline)
+
+
+def sample_frames():
+    """Two players: KC QB at home in weeks 1-3 (week 1 listed twice), BUF WR away in week 1"""
+    weekly = pd.DataFrame([
+        {'player_id': 'qb_01', 'player_name': 'Home QB', 'position': 'QB', 'team': 'KC',
+         'week': 1, 'season': 2024, 'passing_yards': 250},
+        {'player_id': 'qb_01', 'player_name': 'Home QB', 'position': 'QB', 'team': 'KC',
+         'week': 1, 'season': 2024, 'passing_yards': 300},
+        {'player_id': 'qb_01', 'player_name': 'Home QB', 'position': 'QB', 'team': 'KC',
+         'week': 3, 'season': 2024, 'passing_yards': 280},
+        {'player_id': 'qb_01', 'player_name': 'Home QB', 'position': 'QB', 'team': 'KC',
+         'week': 2, 'season': 2024, 'passing_yards': 210},
+        {'player_id': 'wr_01', 'player_name': 'Away WR', 'position': 'WR', 'team': 'BUF',
+         'week': 1, 'season': 2024, 'receiving_yards': 90},
+    ])
+    rosters = pd.DataFrame([
+        {'player_id': 'qb_01', 'season': 2024, 'jersey_number': 15, 'status': 'ACT'},
+        {'player_id': 'wr_01', 'season': 2024, 'jersey_number': 10, 'status': 'INA'},
+        {'player_id': 'wr_01', 'season': 2024, 'jersey_number': 11, 'status': 'ACT'},
+    ])
+    injuries = pd.DataFrame([
+        {'gsis_id': 'qb_01', 'season': 2024, 'week': 1, 'report_status': 'Questionable',
+         'report_primary_injury': 'Ankle', 'practice_status': 'Limited', 'date_modified': 2},
+        {'gsis_id': 'qb_01', 'season': 2024, 'week': 1, 'report_status': 'Out',
+         'report_primary_injury': 'Ankle', 'practice_status': 'Did Not Participate', 'date_modified': 1},
+        {'gsis_id': 'qb_01', 'season': 2024, 'week': 2, 'report_status': 'Note',
+         'report_primary_injury': None, 'practice_status': None, 'date_modified': 3},
+    ])
+    schedule = pd.DataFrame([
+        {'game_id': '2024_01_BUF_KC', 'season': 2024, 'week': 1, 'home_team': 'KC', 'away_team': 'BUF',
+         'home_score': 27, 'away_score': 20, 'spread_line': 3.0, 'total_line': 46.0},
+        {'game_id': '2024_02_LA_KC', 'season': 2024, 'week': 2, 'home_team': 'KC', 'away_team': 'LA',
+         'home_score': 24, 'away_score': 17, 'spread_line': 6.5, 'total_line': 44.5},
+        {'game_id': '2024_03_KC_DEN', 'season': 2024, 'week': 3, 'home_team': 'DEN', 'away_team': 'KC',
+         'home_score': 10, 'away_score': 31, 'spread_line': -4.0, 'total_line': 41.0},
+    ])
+    return weekly, rosters, injuries, schedule
+
+
+def build(output_dir, **frames):
+    pipeline = nfl_data_pipeline.NFLDataPipeline(output_dir)
+    return pipeline.build_player_week_table([2024], **frames)
+
+
+def check_joins_and_index():
+    weekly, rosters, injuries, schedule = sample_frames()
+    with tempfile.TemporaryDirectory() as output_dir:
+        table = build(output_dir, weekly=weekly, rosters=rosters, injuries=injuries, schedule=schedule)
+        # JSON output is written in key order
+        written = pd.read_json(os.path.join(output_dir, 'player_weeks_2024.json'))
+
+    # Deduplicated and sorted on (player_id, season, week)
+    assert len(table) == 4
+    assert table.index.is_unique
+    assert table.index.is_monotonic_increasing
+    assert table.loc[('qb_01', 2024, 1), 'passing_yards'] == 300
+
+    # Roster attributes: last roster row per player-season wins
+    assert table.loc[('wr_01', 2024, 1), 'jersey_number'] == 11
+    assert table.loc[('wr_01', 2024, 1), 'roster_status'] == 'ACT'
+
+    # Injuries: latest revision wins, unmapped statuses are HEALTHY
+    assert table.loc[('qb_01', 2024, 1), 'injury_status'] == 'QUESTIONABLE'
+    assert table.loc[('qb_01', 2024, 2), 'injury_status'] == 'HEALTHY'
+    assert table.loc[('qb_01', 2024, 3), 'injury_status'] == 'HEALTHY'
+
+    # Home/away flipping of opponent, scores and projected margin
+    home = table.loc[('qb_01', 2024, 1)]
+    away = table.loc[('wr_01', 2024, 1)]
+    assert home['game_id'] == away['game_id'] == '2024_01_BUF_KC'
+    assert home['opponent'] == 'BUF' and bool(home['is_home_game'])
+    assert away['opponent'] == 'KC' and not bool(away['is_home_game'])
+    assert (home['team_score'], home['opponent_score']) == (27, 20)
+    assert (away['team_score'], away['opponent_score']) == (20, 27)
+    assert home['team_projected_margin'] == 3.0 and away['team_projected_margin'] == -3.0
+    assert home['game_total_points'] == away['game_total_points'] == 47
+    assert table.loc[('qb_01', 2024, 3), 'team_projected_margin'] == 4.0
+
+    # Per-player and week-range reads on the sorted index
+    assert list(table.loc['qb_01'].index.get_level_values('week')) == [1, 2, 3]
+    week_range = table.loc[('qb_01', 2024, slice(2, 3)), :]
+    assert list(week_range['opponent']) == ['LA', 'DEN']
+
+    assert list(zip(written['player_id'], written['week'])) == [
+        ('qb_01', 1), ('qb_01', 2), ('qb_01', 3), ('wr_01', 1)
+    ]
+    print("✅ Joins, deduplication and index reads look correct")
+
+
+def check_roster_join_requires_full_key():
+    weekly, rosters, injuries, schedule = sample_frames()
+    with tempfile.TemporaryDirectory() as output_dir:
+        table = build(output_dir, weekly=weekly, rosters=rosters.drop(columns=['player_id']),
+                      injuries=injuries, schedule=schedule)
+
+    assert len(table) == 4
+    assert 'jersey_number' not in table.columns
+    print("✅ Roster join skipped when key columns are missing")
+
+
+def check_empty_injuries_leave_status_unknown():
+    weekly, rosters, _, schedule = sample_frames()
+    with tempfile.TemporaryDirectory() as output_dir:
+        table = build(output_dir, weekly=weekly, rosters=rosters, injuries=pd.DataFrame(), schedule=schedule)
+
+    assert len(table) == 4
+    for column in ['injury_status', 'report_status', 'report_primary_injury', 'practice_status']:
+        assert table[column].isna().all(), column
+    assert (table['opponent'].notna()).all()
+    print("✅ Injury status left unknown when no injury data loaded")
+
+
+def check_injury_join_tolerates_missing_columns():
+    weekly, rosters, injuries, schedule = sample_frames()
+    with tempfile.TemporaryDirectory() as output_dir:
+        table = build(output_dir, weekly=weekly, rosters=rosters,
+                      injuries=injuries.drop(columns=['practice_status']), schedule=schedule)
+
+    assert len(table) == 4
+    assert table.loc[('qb_01', 2024, 1), 'injury_status'] == 'QUESTIONABLE'
+    assert table.loc[('wr_01', 2024, 1), 'injury_status'] == 'HEALTHY'
+    assert table['practice_status'].isna().all()
+    print("✅ Injury join kept when an optional column is missing")
+
+
+def check_schedule_join_requires_teams():
+    weekly, rosters, injuries, schedule = sample_frames()
+    with tempfile.TemporaryDirectory() as output_dir:
+        table = build(output_dir, weekly=weekly, rosters=rosters, injuries=injuries,
+                      schedule=schedule.drop(columns=['away_team']))
+
+    assert len(table) == 4
+    assert 'opponent' not in table.columns
+    assert table.loc[('qb_01', 2024, 1), 'injury_status'] == 'QUESTIONABLE'
+    print("✅ Schedule join skipped when team columns are missing")
+
+
+def check_empty_weekly_writes_nothing():
+    _, rosters, injuries, schedule = sample_frames()
+    with tempfile.TemporaryDirectory() as output_dir:
+        table = build(output_dir, weekly=pd.DataFrame(), rosters=rosters, injuries=injuries, schedule=schedule)
+        written = os.path.exists(os.path.join(output_dir, 'player_weeks_2024.json'))
+
+    assert table.empty
+    assert not written
+    print("✅ No player-week file written without weekly stats")
+
+
+def main():
+    print("🧪 Player-Week Table Tests")
+    print("==========================\n")
+
+    check_joins_and_index()
+    check_roster_join_requires_full_key()
+    check_empty_injuries_leave_status_unknown()
+    check_injury_join_tolerates_missing_columns()
+    check_schedule_join_requires_teams()
+    check_empty_weekly_writes_nothing()
+
+    print("\n🎉 All player-week table tests passed")
+
+
+if __name__ == "__main__":
+    main()
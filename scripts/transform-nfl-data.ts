@@ -6,6 +6,7 @@
  * 
  * This script:
  * 1. Reads JSON files generated by nfl-data-pipeline.py
+ *    (the unified player_weeks file when present, else the per-type stats files)
  * 2. Transforms the data to match our database schema
  * 3. Validates data integrity
  * 4. Outputs database-ready JSON files
@@ -39,7 +40,8 @@ const TEAM_MAPPING: Record<string, string> = {
   'KC': 'KC', 'LV': 'LV', 'LAC': 'LAC', 'LAR': 'LAR', 'MIA': 'MIA',
   'MIN': 'MIN', 'NE': 'NE', 'NO': 'NO', 'NYG': 'NYG', 'NYJ': 'NYJ',
   'PHI': 'PHI', 'PIT': 'PIT', 'SF': 'SF', 'SEA': 'SEA', 'TB': 'TB',
-  'TEN': 'TEN', 'WAS': 'WAS'
+  'TEN': 'TEN', 'WAS': 'WAS',
+  'LA': 'LAR' // nflverse schedules use LA for the Rams
 }
 
 // Position mapping
@@ -80,6 +82,12 @@ interface NFLDataStats {
   receptions?: number
   receiving_yards?: number
   receiving_tds?: number
+  // Game context, present in the unified player_weeks file
+  opponent?: string | null
+  is_home_game?: boolean | null
+  team_score?: number | null
+  opponent_score?: number | null
+  game_total_points?: number | null
   [key: string]: any
 }
 
@@ -210,12 +218,16 @@ class NFLDataTransformer {
         const transformedStat: PlayerGameStats = {
           id: uuidv4(),
           player_id: playerId,
+          game_id: null, // FK to nfl_games UUID; the nflverse game_id is not a UUID
           week: stat.week,
           season: stat.season,
           
-          // We'll need opponent info from schedule data
-          opponent: 'TBD' as any, // TODO: Get from schedule
-          is_home_game: false, // TODO: Get from schedule
+          // Opponent info is joined from schedule data in the player_weeks file
+          opponent: (stat.opponent ? TEAM_MAPPING[stat.opponent] || stat.opponent : 'TBD') as any,
+          is_home_game: stat.is_home_game ?? false,
+          team_score: stat.team_score ?? null,
+          opponent_score: stat.opponent_score ?? null,
+          game_total_points: stat.game_total_points ?? null,
           
           // Passing stats
           passing_attempts: stat.attempts || 0,
@@ -374,6 +386,46 @@ class NFLDataTransformer {
     return 'LOW'
   }
 
+  /**
+   * Choose the stats source: the unified player-week table (one row per player
+   * per week) unless it is missing, empty, or older than the per-type stats files
+   */
+  private selectStatsFiles(): string[] {
+    const playerWeeksFile = 'player_weeks_2024.json'
+    const perTypeFiles = [
+      'passing_stats_2024.json',
+      'rushing_stats_2024.json',
+      'receiving_stats_2024.json'
+    ]
+    const playerWeeksPath = path.join(NFL_DATA_DIR, playerWeeksFile)
+
+    let reason: string | null = null
+    if (!fs.existsSync(playerWeeksPath)) {
+      reason = `${playerWeeksFile} not found`
+    } else {
+      const rows = JSON.parse(fs.readFileSync(playerWeeksPath, 'utf-8'))
+      const playerWeeksModified = fs.statSync(playerWeeksPath).mtimeMs
+      const newerFiles = perTypeFiles.filter(file => {
+        const fullPath = path.join(NFL_DATA_DIR, file)
+        return fs.existsSync(fullPath) && fs.statSync(fullPath).mtimeMs > playerWeeksModified
+      })
+
+      if (!Array.isArray(rows) || rows.length === 0) {
+        reason = `${playerWeeksFile} is empty`
+      } else if (newerFiles.length > 0) {
+        reason = `${newerFiles.join(', ')} newer than ${playerWeeksFile}`
+      }
+    }
+
+    if (reason) {
+      console.log(`📂 Stats source: per-type stats files (${reason})`)
+      return perTypeFiles
+    }
+
+    console.log(`📂 Stats source: ${playerWeeksFile}`)
+    return [playerWeeksFile]
+  }
+
   /**
    * Run the complete transformation pipeline
    */
@@ -391,11 +443,7 @@ class NFLDataTransformer {
       console.log(`💾 Saved ${players.length} players to ${playersOutputFile}`)
 
       // Transform stats data
-      const statsFiles = [
-        'passing_stats_2024.json',
-        'rushing_stats_2024.json',
-        'receiving_stats_2024.json'
-      ]
+      const statsFiles = this.selectStatsFiles()
 
       let allStats: PlayerGameStats[] = []
       for (const statsFile of statsFiles) {